@@ -4,17 +4,17 @@ This tool provides an interactive interface to select profiles, perform SSO logi
 and manage role assumptions.
 """
 
-import configparser
+import functools
 import os
 import platform
 import re
 import shutil
 import subprocess
 import sys
+import threading
+from collections.abc import Iterable
 
-import questionary
 import typer
-from questionary import Style
 
 ###############################################################################
 # App Setup
@@ -22,22 +22,99 @@ from questionary import Style
 
 app = typer.Typer(help="A CLI tool to simplify AWS SSO logins.")
 
-# A custom style for questionary prompts
-custom_style_fancy = Style(
-    [
-        ("qmark", "fg:#E91E63 bold"),  # question mark
-        ("question", "bold"),  # question text
-        ("answer", "fg:#2196f3 bold"),  # user answer
-        ("pointer", "fg:#673ab7 bold"),  # pointer used in select boxes
-        ("highlighted", "fg:#03A9F4 bold"),
-        ("selected", "fg:#673ab7 bold"),  # style for a selected item
-        ("separator", "fg:#cc5454"),
-        ("instruction", ""),
-        ("text", ""),
-        ("disabled", "fg:#858585 italic"),
-    ]
+
+@functools.cache
+def _style():
+    """Return the custom questionary prompt style, built on first use.
+
+    questionary (and prompt_toolkit beneath it) is imported lazily so that
+    non-interactive commands such as `list-profiles` and `--help` start fast.
+    """
+    from questionary import Style
+
+    return Style(
+        [
+            ("qmark", "fg:#E91E63 bold"),  # question mark
+            ("question", "bold"),  # question text
+            ("answer", "fg:#2196f3 bold"),  # user answer
+            ("pointer", "fg:#673ab7 bold"),  # pointer used in select boxes
+            ("highlighted", "fg:#03A9F4 bold"),
+            ("selected", "fg:#673ab7 bold"),  # style for a selected item
+            ("separator", "fg:#cc5454"),
+            ("instruction", ""),
+            ("text", ""),
+            ("disabled", "fg:#858585 italic"),
+        ]
+    )
+
+
+# Profile names passed to the AWS CLI. \A...\Z (unlike ^...$) rejects a
+# trailing newline.
+_PROFILE_NAME_RE = re.compile(r"\A[A-Za-z0-9._+\-]+\Z")
+
+# Section headers and key/value lines, as matched by configparser: a header may
+# be followed by trailing text (e.g. a comment), and keys end at the first
+# "=" or ":".
+_SECTION_RE = re.compile(r"\[(?P<header>.+)\]")
+_OPTION_RE = re.compile(r"(?P<key>.*?)\s*[=:]\s*(?P<value>.*)")
+
+# platform.system() may shell out on some platforms, so resolve it once.
+_IS_WINDOWS = platform.system().lower().startswith("win")
+
+# Messages are styled once at import rather than on every call. Templates keep
+# their {placeholders} through styling and are .format()ted at the call site.
+_NO_PROFILES_MSG = typer.style(
+    "No profiles found in ~/.aws/config.", fg=typer.colors.RED
+)
+_NO_PROFILE_SELECTED_MSG = typer.style(
+    "No profile selected. Exiting.", fg=typer.colors.YELLOW
+)
+_MULTIPLE_PROFILES_MSG = typer.style(
+    "Multiple profiles selected. Please select only one.", fg=typer.colors.RED
+)
+_MULTIPLE_ROLES_MSG = typer.style(
+    "Multiple roles selected. Please select only one or skip.", fg=typer.colors.RED
+)
+_INVALID_NAME_MSG = typer.style("Invalid profile name!", fg=typer.colors.RED)
+_AWS_CLI_NOT_FOUND_MSG = typer.style("AWS CLI not found in PATH.", fg=typer.colors.RED)
+_LOGIN_FAILED_MSG = typer.style("Login failed! See error above.", fg=typer.colors.RED)
+_LOGGING_IN_TEMPLATE = typer.style(
+    "\nLogging in with profile: {profile}", fg=typer.colors.CYAN, bold=True
+)
+_LOGIN_SUCCESS_PREFIX = typer.style(
+    "Login successful for profile: ", fg=typer.colors.GREEN, bold=True
+)
+_CHECKMARK = typer.style(" ✅", fg=typer.colors.GREEN, bold=True)
+_NO_ROLE_PROFILE_MSG = typer.style(
+    "No associated role profile found. Exiting...", fg=typer.colors.YELLOW
+)
+_SKIP_ROLE_MSG = typer.style(
+    "Skipping role assumption. Goodbye!", fg=typer.colors.YELLOW
+)
+_SELECTED_ROLE_TEMPLATE = typer.style(
+    "Selected role profile: {role}", fg=typer.colors.CYAN, bold=True
+)
+_EXPORT_HINT_MSG = typer.style(
+    "Run the following in your shell or use eval to persist it:",
+    fg=typer.colors.MAGENTA,
+)
+
+# AWS_PROFILE export instructions for PowerShell/CMD and for bash, zsh, etc.
+_WINDOWS_EXPORT_TEMPLATE = typer.style(
+    '\n# For PowerShell:\n$Env:AWS_PROFILE = "{role}"\n'
+    "# For CMD:\nset AWS_PROFILE={role}\n"
+    "# Then run:\naws sts get-caller-identity\n",
+    fg=typer.colors.YELLOW,
+)
+_UNIX_EXPORT_TEMPLATE = typer.style(
+    "\nexport AWS_PROFILE={role}\n# Then run:\naws sts get-caller-identity\n",
+    fg=typer.colors.YELLOW,
 )
 
+# Parsed config files keyed by path, alongside the (st_mtime_ns, st_size) they
+# were parsed at so edits to the file invalidate the entry.
+_PROFILE_CACHE: dict[str, tuple[int, int, dict]] = {}
+
 ###############################################################################
 # Helper Functions
 ###############################################################################
@@ -47,66 +124,178 @@ def read_aws_profiles(config_file: str = None) -> dict:
     """Read AWS profiles from a config file path.
 
     Defaulting to ~/.aws/config if none is provided. Return a dict of profiles.
+    Results are cached per file until its mtime or size changes; callers always
+    receive their own copy.
     """
     if not config_file:
         config_file = os.path.expanduser("~/.aws/config")
+    config_file = os.path.abspath(config_file)
+
+    try:
+        stat = os.stat(config_file)
+        cached = _PROFILE_CACHE.get(config_file)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return _copy_profiles(cached[2])
+
+        # utf-8-sig drops the BOM some Windows editors write, which would
+        # otherwise hide the first section header
+        with open(config_file, "r", encoding="utf-8-sig") as f:
+            # Key the cache on the handle actually parsed, not the earlier stat
+            stat = os.fstat(f.fileno())
+            profiles = _parse_aws_config(f)
+    except FileNotFoundError:
+        return {}
+
+    _PROFILE_CACHE[config_file] = (stat.st_mtime_ns, stat.st_size, profiles)
+    return _copy_profiles(profiles)
+
+
+read_aws_profiles.cache_clear = _PROFILE_CACHE.clear
+
+
+def _copy_profiles(profiles: dict) -> dict:
+    """Copy a parsed profiles dict so callers cannot mutate the cached one.
+
+    Values are always plain strings, so copying the two dict levels suffices
+    and avoids copy.deepcopy's per-object memo bookkeeping.
+    """
+    return {name: dict(data) for name, data in profiles.items()}
 
-    parser = configparser.ConfigParser()
-    parser.optionxform = str  # Keep case sensitivity of keys
-    parser.read(config_file)
 
+def _parse_aws_config(lines: Iterable[str]) -> dict:
+    """Parse AWS config `lines` into a dict of {profile_name: {key: value}}.
+
+    A minimal single-pass INI scanner covering the AWS config grammar:
+    `[profile X]` headers, `key = value` (or `key: value`) lines, `#`/`;`
+    comments and continuation lines indented deeper than their key (e.g. nested
+    `s3 =` settings). Unlike configparser, blank lines inside a continuation
+    value are dropped rather than kept. As with configparser, `[DEFAULT]` is not
+    a profile; its keys are inherited by every profile that does not set them.
+    Lines are consumed as they are read, so an open file can be passed directly.
+    """
     profiles = {}
-    for section in parser.sections():
-        raw_profile_name = section.replace("profile ", "")
-        profiles[raw_profile_name] = dict(parser[section])
+    defaults = {}
+    section = None
+    key = None
+    key_indent = 0
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        indent = len(raw_line) - len(raw_line.lstrip())
+        if key is not None and indent > key_indent:
+            # Indented deeper than its key: continuation of the previous value
+            section[key] = f"{section[key]}\n{line}"
+            continue
+
+        key = None
+        if line[0] == "[":
+            section = _open_section(line, profiles, defaults)
+        elif section is not None:
+            match = _OPTION_RE.match(line)
+            if match:
+                key = match["key"]
+                key_indent = indent
+                section[key] = match["value"]
+
+    if defaults:
+        for data in profiles.values():
+            for default_key, value in defaults.items():
+                data.setdefault(default_key, value)
 
     return profiles
 
 
-def pick_base_profile(profiles: dict) -> str:
+def _open_section(line: str, profiles: dict, defaults: dict) -> dict | None:
+    """Return the dict that keys under header `line` should be stored in.
+
+    `[DEFAULT]` maps to `defaults`; a malformed header returns None so its keys
+    are ignored rather than misfiled under the previous section.
+    """
+    match = _SECTION_RE.match(line)
+    if not match:
+        return None
+    if match["header"] == "DEFAULT":
+        return defaults
+    name = match["header"].strip().removeprefix("profile ")
+    return profiles.setdefault(name, {})
+
+
+def pick_base_profile(profiles: dict, profile_names: list = None) -> str:
     """Prompt the user to select exactly one base (SSO) profile.
 
     Return the chosen profile name, or raise typer.Exit if none or multiple selected.
+    A single available profile is returned without prompting. `profile_names` may
+    be passed pre-sorted to avoid sorting `profiles` again.
     """
-    profile_names = sorted(profiles.keys())
+    if profile_names is None:
+        profile_names = sorted(profiles)
+    if len(profile_names) == 1:
+        return profile_names[0]
+
+    import questionary
+
     selected = questionary.checkbox(
         "Select an AWS profile\n (use ↑/↓ to move, SPACE to check, ENTER to confirm)",
         choices=profile_names,
-        style=custom_style_fancy,
+        style=_style(),
         instruction="",
     ).ask()
 
     if not selected:
-        typer.echo(typer.style("No profile selected. Exiting.", fg=typer.colors.YELLOW))
+        typer.echo(_NO_PROFILE_SELECTED_MSG)
         raise typer.Exit()
     if len(selected) > 1:
-        typer.echo(
-            typer.style(
-                "Multiple profiles selected. Please select only one.",
-                fg=typer.colors.RED,
-            )
-        )
+        typer.echo(_MULTIPLE_PROFILES_MSG)
         raise typer.Exit()
 
     return selected[0]
 
 
-def perform_sso_login(profile: str):
-    """Run 'aws sso login --profile <profile>', raising typer.Exit on failure."""
-    if not re.match(r"^[A-Za-z0-9._\-\+]+$", profile):
-        typer.echo(typer.style("Invalid profile name!", fg=typer.colors.RED))
+@functools.cache
+def _which_aws(search_path: str | None, command: str = "aws") -> str | None:
+    """Resolve `command` on `search_path`, memoized per (PATH, command) value."""
+    return shutil.which(command, path=search_path)
+
+
+def _aws_executable() -> str | None:
+    """Return the AWS CLI to run, honouring an AWS_CLI_PATH override.
+
+    The override is resolved like a command name, so it must name an existing
+    executable (an absolute/relative path, or a name found on PATH). Return
+    None if the CLI cannot be found.
+    """
+    command = os.environ.get("AWS_CLI_PATH") or "aws"
+    return _which_aws(os.environ.get("PATH"), command)
+
+
+def perform_sso_login(profile: str, replace_process: bool = False):
+    """Run 'aws sso login --profile <profile>', raising typer.Exit on failure.
+
+    With `replace_process`, exec the AWS CLI in place of this process instead of
+    running it as a child; this function then never returns. On Windows, where
+    exec spawns a detached process rather than replacing this one, the CLI is
+    always run as a child.
+    """
+    if not _PROFILE_NAME_RE.match(profile):
+        typer.echo(_INVALID_NAME_MSG)
         raise typer.Exit(code=1)
     try:
-        aws_executable = shutil.which("aws")
+        aws_executable = _aws_executable()
         if not aws_executable:
-            typer.echo(typer.style("AWS CLI not found in PATH.", fg=typer.colors.RED))
+            typer.echo(_AWS_CLI_NOT_FOUND_MSG)
             raise typer.Exit(code=1)
 
+        if replace_process and not _IS_WINDOWS:
+            os.execv(  # noqa: S606
+                aws_executable, [aws_executable, "sso", "login", "--profile", profile]
+            )
+
         subprocess.run(  # noqa: S603
             [aws_executable, "sso", "login", "--profile", profile], check=True
         )
     except subprocess.CalledProcessError as exc:
-        typer.echo(typer.style("Login failed! See error above.", fg=typer.colors.RED))
+        typer.echo(_LOGIN_FAILED_MSG)
         raise typer.Exit(code=exc.returncode) from exc
 
 
@@ -115,18 +304,35 @@ def find_role_profiles(profiles: dict, base_profile: str) -> list:
 
     Each role profile must have 'role_arn' and 'source_profile = base_profile'.
     """
-    role_profile_names = []
-    for name, data in profiles.items():
-        if data.get("source_profile") == base_profile and "role_arn" in data:
-            role_profile_names.append(name)
-    return role_profile_names
+    return [
+        name
+        for name, data in profiles.items()
+        if data.get("source_profile") == base_profile and "role_arn" in data
+    ]
+
+
+def _has_role_profile(profiles: dict, base_profile: str) -> bool:
+    """Return True if any role profile references `base_profile`.
+
+    Same criteria as find_role_profiles, but stops at the first match.
+    """
+    return any(
+        data.get("source_profile") == base_profile and "role_arn" in data
+        for data in profiles.values()
+    )
 
 
-def pick_role_profile(role_profile_names: list) -> str:
+def pick_role_profile(role_profile_names: list, auto_select: bool = False) -> str:
     """Prompt the user to pick exactly one role profile (or skip).
 
     Return the chosen role profile name, or the string 'Skip role assumption'.
+    With `auto_select`, a single role profile is returned without prompting.
     """
+    if auto_select and len(role_profile_names) == 1:
+        return role_profile_names[0]
+
+    import questionary
+
     role_profile_names.append("Skip role assumption")
 
     selected = questionary.checkbox(
@@ -134,7 +340,7 @@ def pick_role_profile(role_profile_names: list) -> str:
         "Pick one to assume or skip:\n"
         "(use ↑/↓ to move, SPACE to check, ENTER to confirm)",
         choices=role_profile_names,
-        style=custom_style_fancy,
+        style=_style(),
         instruction="",
     ).ask()
 
@@ -142,12 +348,7 @@ def pick_role_profile(role_profile_names: list) -> str:
         # If user hits enter without selecting anything
         return "Skip role assumption"
     if len(selected) > 1:
-        typer.echo(
-            typer.style(
-                "Multiple roles selected. Please select only one or skip.",
-                fg=typer.colors.RED,
-            )
-        )
+        typer.echo(_MULTIPLE_ROLES_MSG)
         return "Skip role assumption"
 
     return selected[0]
@@ -158,41 +359,11 @@ def show_export_instructions(role_choice: str):
 
     Confirm caller identity with 'aws sts get-caller-identity'.
     """
-    system_os = platform.system().lower()
+    typer.echo(_SELECTED_ROLE_TEMPLATE.format(role=role_choice))
+    typer.echo(_EXPORT_HINT_MSG)
 
-    typer.echo(
-        typer.style(
-            f"Selected role profile: {role_choice}",
-            fg=typer.colors.CYAN,
-            bold=True,
-        )
-    )
-    typer.echo(
-        typer.style(
-            "Run the following in your shell or use eval to persist it:",
-            fg=typer.colors.MAGENTA,
-        )
-    )
-
-    if "windows" in system_os:
-        # For PowerShell or CMD
-        typer.echo(
-            typer.style(
-                f'\n# For PowerShell:\n$Env:AWS_PROFILE = "{role_choice}"\n'
-                f"# For CMD:\nset AWS_PROFILE={role_choice}\n"
-                "# Then run:\naws sts get-caller-identity\n",
-                fg=typer.colors.YELLOW,
-            )
-        )
-    else:
-        # For bash, zsh, etc.
-        typer.echo(
-            typer.style(
-                f"\nexport AWS_PROFILE={role_choice}\n"
-                "# Then run:\naws sts get-caller-identity\n",
-                fg=typer.colors.YELLOW,
-            )
-        )
+    template = _WINDOWS_EXPORT_TEMPLATE if _IS_WINDOWS else _UNIX_EXPORT_TEMPLATE
+    typer.echo(template.format(role=role_choice))
 
 
 ###############################################################################
@@ -216,7 +387,7 @@ def list_profiles(
         raise typer.Exit()
 
     typer.echo("Available AWS Profiles:")
-    for profile_name in sorted(profiles.keys()):
+    for profile_name in sorted(profiles):
         typer.echo(f" - {profile_name}")
 
 
@@ -227,57 +398,61 @@ def login(
         "--config-file",
         "-c",
         help="Path to AWS config file (defaults to ~/.aws/config).",
-    )
+    ),
+    yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        envvar="AWSSOX_AUTO_SINGLE",
+        help="Assume the role without prompting when only one references the profile.",
+    ),
+    exec_login: bool = typer.Option(
+        False,
+        "--exec",
+        help="Hand over to 'aws sso login' when no role references the profile.",
+    ),
 ):
     """Prompt user to pick one AWS profile from the specified config file.
 
     Then run 'aws sso login', optionally pick a role referencing that profile,
     and display how to export AWS_PROFILE for the selected role.
     """
+    # Resolve the AWS CLI in the background so the PATH walk overlaps with
+    # config parsing and the profile prompt; perform_sso_login hits the cache.
+    threading.Thread(target=_aws_executable, daemon=True).start()
+
     profiles = read_aws_profiles(config_file)
     if not profiles:
-        typer.echo(
-            typer.style("No profiles found in ~/.aws/config.", fg=typer.colors.RED)
-        )
+        typer.echo(_NO_PROFILES_MSG)
         raise typer.Exit()
 
     # Step 1: Pick base profile
+    profile_names = sorted(profiles)
+    chosen_profile = pick_base_profile(profiles, profile_names)
 
-    chosen_profile = pick_base_profile(profiles)
-
-    typer.echo(
-        typer.style(
-            f"\nLogging in with profile: {chosen_profile}",
-            fg=typer.colors.CYAN,
-            bold=True,
-        )
-    )
+    typer.echo(_LOGGING_IN_TEMPLATE.format(profile=chosen_profile))
 
-    # Step 2: Perform SSO login
-    perform_sso_login(chosen_profile)
+    # Step 2: Perform SSO login. With --exec and no roles to pick afterwards,
+    # nothing is left for awssox to do, so the AWS CLI replaces this process.
+    has_roles = _has_role_profile(profiles, chosen_profile)
+    replace_process = exec_login and not has_roles
+    perform_sso_login(chosen_profile, replace_process=replace_process)
     typer.echo(
-        typer.style("Login successful for profile: ", fg=typer.colors.GREEN, bold=True)
+        _LOGIN_SUCCESS_PREFIX
         + typer.style(chosen_profile, fg=typer.colors.MAGENTA, bold=True)
-        + typer.style(" ✅", fg=typer.colors.GREEN, bold=True)
+        + _CHECKMARK
     )
 
     # Step 3: Find any role profiles referencing the chosen base
-    role_profile_names = find_role_profiles(profiles, chosen_profile)
-    if not role_profile_names:
-        typer.echo(
-            typer.style(
-                "No associated role profile found. Exiting...",
-                fg=typer.colors.YELLOW,
-            )
-        )
+    if not has_roles:
+        typer.echo(_NO_ROLE_PROFILE_MSG)
         return
+    role_profile_names = find_role_profiles(profiles, chosen_profile)
 
     # Step 4: Prompt user to pick one role (or skip)
-    role_choice = pick_role_profile(role_profile_names)
+    role_choice = pick_role_profile(role_profile_names, auto_select=yes)
     if role_choice == "Skip role assumption":
-        typer.echo(
-            typer.style("Skipping role assumption. Goodbye!", fg=typer.colors.YELLOW)
-        )
+        typer.echo(_SKIP_ROLE_MSG)
         return
 
     # Step 5: Show instructions for exporting AWS_PROFILE
@@ -1,5 +1,7 @@
 # ./tests/unit/test_awssox.py  # noqa: D100
 
+import os
+import shutil
 import subprocess
 from unittest.mock import patch
 
@@ -10,6 +12,33 @@ import awssox.awssox as awssox_module
 from awssox.awssox import read_aws_profiles
 
 
+@pytest.fixture(autouse=True)
+def clear_profile_cache():
+    """Start every test with empty read_aws_profiles and aws lookup caches."""
+    read_aws_profiles.cache_clear()
+    awssox_module._which_aws.cache_clear()
+    yield
+    read_aws_profiles.cache_clear()
+    awssox_module._which_aws.cache_clear()
+
+
+@pytest.fixture
+def no_background_thread():
+    """Stop login from resolving the real AWS CLI on a background thread."""
+    with patch("threading.Thread") as mock_thread:
+        yield mock_thread
+
+
+@pytest.fixture
+def fake_aws(tmp_path):
+    """Path to an executable stand-in for the AWS CLI."""
+    aws = tmp_path / "bin" / "aws"
+    aws.parent.mkdir()
+    aws.write_text("#!/bin/sh\n")
+    aws.chmod(0o755)
+    return str(aws)
+
+
 @pytest.fixture
 def mock_profiles():
     """Sample dictionary of AWS profiles for testing."""
@@ -57,31 +86,180 @@ def test_find_role_profiles_match_single(mock_profiles):
     assert roles == ["dev-1-admin-role"]
 
 
-def test_read_aws_profiles_full_coverage():
-    """Ensure we call parser.optionxform, parser.read, and parse multiple sections.
+@pytest.mark.parametrize(
+    "base_profile, expected",
+    [("dev-1", True), ("dev-2", True), ("some-other-profile", False)],
+)
+def test_has_role_profile(mock_profiles, base_profile, expected):
+    """_has_role_profile agrees with find_role_profiles on existence."""
+    assert awssox_module._has_role_profile(mock_profiles, base_profile) is expected
+    assert bool(awssox_module.find_role_profiles(mock_profiles, base_profile)) is (
+        expected
+    )
+
+
+def test_read_aws_profiles_full_coverage(tmp_path):
+    """Parse headers, key/value pairs, comments and continuation lines."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "# leading comment\n"
+        "[default]\n"
+        "region = eu-west-1\n"
+        "\n"
+        "[profile dev-1]\n"
+        "; another comment\n"
+        "region = us-west-2\n"
+        "sso_start_url = https://aws.apps.com/start#/\n"
+        "s3 =\n"
+        "  max_concurrent_requests = 20\n"
+        "\n"
+        "[profile dev-2]\n"
+        "output=json\n",
+        encoding="utf-8",
+    )
+
+    result = read_aws_profiles(str(config_file))
+
+    assert list(result) == ["default", "dev-1", "dev-2"]
+    assert result["default"] == {"region": "eu-west-1"}
+    assert result["dev-1"]["region"] == "us-west-2"
+    assert result["dev-1"]["sso_start_url"] == "https://aws.apps.com/start#/"
+    assert result["dev-1"]["s3"] == "\nmax_concurrent_requests = 20"
+    assert result["dev-2"]["output"] == "json"
+
+
+def test_read_aws_profiles_header_with_trailing_comment(tmp_path):
+    """Text after a section header's closing bracket does not hide the section."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "[profile z]\nregion=q\n"
+        "[profile a] ; prod\nsource_profile=z\nrole_arn=arn:x\n",
+        encoding="utf-8",
+    )
+
+    result = read_aws_profiles(str(config_file))
+
+    assert result == {
+        "z": {"region": "q"},
+        "a": {"source_profile": "z", "role_arn": "arn:x"},
+    }
+    assert awssox_module.find_role_profiles(result, "z") == ["a"]
+
+
+def test_read_aws_profiles_indented_keys(tmp_path):
+    """Keys sharing an indent are separate keys, not continuation lines."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "[profile dev]\nregion = us-west-2\n\n"
+        "[profile admin]\n"
+        "  role_arn = arn:aws:iam::123456789012:role/admin\n"
+        "  source_profile = dev\n"
+        "  s3 =\n"
+        "    max_concurrent_requests = 20\n"
+        "  [profile b]\n"
+        "  region = eu-west-1\n",
+        encoding="utf-8",
+    )
+
+    result = read_aws_profiles(str(config_file))
+
+    assert result["admin"] == {
+        "role_arn": "arn:aws:iam::123456789012:role/admin",
+        "source_profile": "dev",
+        "s3": "\nmax_concurrent_requests = 20",
+    }
+    assert result["b"] == {"region": "eu-west-1"}
+    assert awssox_module.find_role_profiles(result, "dev") == ["admin"]
+
+
+def test_read_aws_profiles_utf8_bom(tmp_path):
+    """A UTF-8 BOM does not hide the first profile."""
+    config_file = tmp_path / "config"
+    config_file.write_text("[profile a]\nregion = x\n", encoding="utf-8-sig")
 
-    This ensures lines 55-65 are fully covered.
-    """
-    with (
-        patch("configparser.ConfigParser.read") as mock_read,
-        patch("configparser.ConfigParser.sections") as mock_sections,
-        patch("configparser.ConfigParser.__getitem__") as mock_getitem,
-    ):
+    assert read_aws_profiles(str(config_file)) == {"a": {"region": "x"}}
+
+
+def test_read_aws_profiles_colon_delimiter(tmp_path):
+    """Keys end at the first '=' or ':', whichever comes first."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "[profile dev-1]\n"
+        "region: us-east-1\n"
+        "sso_start_url = https://aws.apps.com/start\n",
+        encoding="utf-8",
+    )
+
+    result = read_aws_profiles(str(config_file))
+
+    assert result["dev-1"] == {
+        "region": "us-east-1",
+        "sso_start_url": "https://aws.apps.com/start",
+    }
 
-        mock_sections.return_value = ["profile dev-1", "profile dev-2"]
-        mock_getitem.side_effect = lambda section: {
-            "region": "us-west-2",
-            "output": "json",
-        }
 
-        result = read_aws_profiles()
-        mock_read.assert_called_once()
-        mock_sections.assert_called_once()
+def test_read_aws_profiles_default_section_is_inherited(tmp_path):
+    """[DEFAULT] is not a profile; its keys fill in those a profile lacks."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "[DEFAULT]\nregion = eu-west-1\noutput = json\n\n"
+        "[profile dev-1]\nregion = us-west-2\n\n"
+        "[profile dev-2]\n",
+        encoding="utf-8",
+    )
 
-        assert "dev-1" in result
-        assert "dev-2" in result
-        assert result["dev-1"]["region"] == "us-west-2"
-        assert result["dev-2"]["output"] == "json"
+    result = read_aws_profiles(str(config_file))
+
+    assert result == {
+        "dev-1": {"region": "us-west-2", "output": "json"},
+        "dev-2": {"region": "eu-west-1", "output": "json"},
+    }
+
+
+def test_read_aws_profiles_only_strips_leading_profile_prefix(tmp_path):
+    """Only a leading 'profile ' is removed from section names."""
+    config_file = tmp_path / "config"
+    config_file.write_text(
+        "[profile profile foo]\nregion = us-west-2\n\n"
+        "[sso-session my-profile sso]\nsso_region = us-east-1\n",
+        encoding="utf-8",
+    )
+
+    result = read_aws_profiles(str(config_file))
+
+    assert list(result) == ["profile foo", "sso-session my-profile sso"]
+
+
+def test_read_aws_profiles_missing_file(tmp_path):
+    """A missing config file yields no profiles."""
+    assert read_aws_profiles(str(tmp_path / "missing")) == {}
+
+
+def test_read_aws_profiles_cached(tmp_path):
+    """A second read of an unchanged file is served from the cache."""
+    config_file = tmp_path / "config"
+    config_file.write_text("[profile dev-1]\nregion = us-west-2\n")
+
+    first = read_aws_profiles(str(config_file))
+    with patch.object(awssox_module, "_parse_aws_config") as mock_parse:
+        second = read_aws_profiles(str(config_file))
+        mock_parse.assert_not_called()
+
+    assert first == second == {"dev-1": {"region": "us-west-2"}}
+    second["dev-1"]["region"] = "mutated"
+    assert read_aws_profiles(str(config_file))["dev-1"]["region"] == "us-west-2"
+
+
+def test_read_aws_profiles_cache_invalidated_on_change(tmp_path):
+    """Editing the config file causes it to be parsed again."""
+    config_file = tmp_path / "config"
+    config_file.write_text("[profile dev-1]\nregion = us-west-2\n")
+    assert list(read_aws_profiles(str(config_file))) == ["dev-1"]
+
+    config_file.write_text(
+        "[profile dev-1]\nregion = us-west-2\n\n[profile dev-2]\nregion = eu-west-1\n"
+    )
+    assert list(read_aws_profiles(str(config_file))) == ["dev-1", "dev-2"]
 
 
 ###############################################################################
@@ -90,8 +268,8 @@ def test_read_aws_profiles_full_coverage():
 @pytest.mark.parametrize(
     "profile_names, selected, should_raise, expected",
     [
-        (["one"], [], True, None),  # user selected nothing => raise typer.Exit
-        (["one"], ["one", "two"], True, None),  # multiple => raise
+        (["one", "two"], [], True, None),  # user selected nothing => raise typer.Exit
+        (["one", "two"], ["one", "two"], True, None),  # multiple => raise
         (["one", "two"], ["one"], False, "one"),  # single => ok
     ],
 )
@@ -113,6 +291,13 @@ def test_pick_base_profile(
         assert chosen == expected
 
 
+@patch("questionary.checkbox")
+def test_pick_base_profile_single_skips_prompt(mock_checkbox):
+    """A single profile is chosen without prompting."""
+    assert awssox_module.pick_base_profile({"only": {}}) == "only"
+    mock_checkbox.assert_not_called()
+
+
 ###############################################################################
 # perform_sso_login
 ###############################################################################
@@ -123,7 +308,7 @@ def test_perform_sso_login_success(mock_run):
     awssox_module.perform_sso_login("dev-1")
 
     mock_run.assert_called_once()
-    (args, kwargs) = mock_run.call_args
+    args, kwargs = mock_run.call_args
     assert args[0][1:] == ["sso", "login", "--profile", "dev-1"]
     assert "aws" in args[0][0]  # or a regex check
     assert kwargs["check"] is True
@@ -139,6 +324,109 @@ def test_perform_sso_login_failure(mock_run):
         awssox_module.perform_sso_login("dev-1")
 
 
+@patch("subprocess.run")
+def test_perform_sso_login_aws_cli_path_override(mock_run, monkeypatch, fake_aws):
+    """AWS_CLI_PATH pins the executable instead of searching PATH for 'aws'."""
+    monkeypatch.setenv("AWS_CLI_PATH", fake_aws)
+    with patch("shutil.which", wraps=shutil.which) as mock_which:
+        awssox_module.perform_sso_login("dev-1")
+        mock_which.assert_called_once_with(fake_aws, path=os.environ.get("PATH"))
+
+    args, _ = mock_run.call_args
+    assert args[0][0] == fake_aws
+
+
+@patch("subprocess.run")
+def test_perform_sso_login_bad_aws_cli_path_override(mock_run, monkeypatch, capsys):
+    """An AWS_CLI_PATH that is not an executable exits with a clear message."""
+    monkeypatch.setenv("AWS_CLI_PATH", "/nonexistent/aws")
+    with pytest.raises(typer.Exit) as exc_info:
+        awssox_module.perform_sso_login("dev-1")
+
+    assert exc_info.value.exit_code == 1
+    assert "AWS CLI not found in PATH." in capsys.readouterr().out
+    mock_run.assert_not_called()
+
+
+def test_aws_executable_override_cached(monkeypatch, fake_aws):
+    """The AWS_CLI_PATH override is resolved once, like the PATH lookup."""
+    monkeypatch.setenv("AWS_CLI_PATH", fake_aws)
+    with patch("shutil.which", wraps=shutil.which) as mock_which:
+        assert awssox_module._aws_executable() == fake_aws
+        assert awssox_module._aws_executable() == fake_aws
+        assert mock_which.call_count == 1
+
+
+def test_aws_executable_cached_per_path(monkeypatch):
+    """PATH is only searched again when it changes."""
+    monkeypatch.delenv("AWS_CLI_PATH", raising=False)
+    monkeypatch.setenv("PATH", "/first")
+    awssox_module._which_aws.cache_clear()
+    with patch("shutil.which", return_value="/first/aws") as mock_which:
+        assert awssox_module._aws_executable() == "/first/aws"
+        assert awssox_module._aws_executable() == "/first/aws"
+        assert mock_which.call_count == 1
+
+        monkeypatch.setenv("PATH", "/second")
+        awssox_module._aws_executable()
+        assert mock_which.call_count == 2
+    awssox_module._which_aws.cache_clear()
+
+
+@patch("subprocess.run")
+@patch("os.execv", side_effect=SystemExit)  # a real exec never returns
+def test_perform_sso_login_replace_process(mock_execv, mock_run, monkeypatch, fake_aws):
+    """replace_process execs the AWS CLI instead of running a child process."""
+    monkeypatch.setenv("AWS_CLI_PATH", fake_aws)
+    with pytest.raises(SystemExit):
+        awssox_module.perform_sso_login("dev-1", replace_process=True)
+
+    mock_execv.assert_called_once_with(
+        fake_aws, [fake_aws, "sso", "login", "--profile", "dev-1"]
+    )
+    mock_run.assert_not_called()
+
+
+@patch("subprocess.run")
+@patch("os.execv")
+@patch.object(awssox_module, "_IS_WINDOWS", True)
+def test_perform_sso_login_replace_process_windows(
+    mock_execv, mock_run, monkeypatch, fake_aws
+):
+    """On Windows the AWS CLI always runs as a child process."""
+    monkeypatch.setenv("AWS_CLI_PATH", fake_aws)
+    awssox_module.perform_sso_login("dev-1", replace_process=True)
+
+    mock_execv.assert_not_called()
+    mock_run.assert_called_once_with(
+        [fake_aws, "sso", "login", "--profile", "dev-1"], check=True
+    )
+
+
+@patch("os.execv", side_effect=SystemExit)
+def test_perform_sso_login_replace_process_bare_override(
+    mock_execv, monkeypatch, fake_aws
+):
+    """A bare AWS_CLI_PATH name is resolved on PATH before exec."""
+    monkeypatch.setenv("PATH", os.path.dirname(fake_aws))
+    monkeypatch.setenv("AWS_CLI_PATH", "aws")
+    with pytest.raises(SystemExit):
+        awssox_module.perform_sso_login("dev-1", replace_process=True)
+
+    mock_execv.assert_called_once_with(
+        fake_aws, [fake_aws, "sso", "login", "--profile", "dev-1"]
+    )
+
+
+@pytest.mark.parametrize("profile", ["dev 1", "dev-1;rm -rf", "dev-1\n", ""])
+@patch("subprocess.run")
+def test_perform_sso_login_invalid_name(mock_run, profile):
+    """Profile names outside the allowed character set are rejected."""
+    with pytest.raises(typer.Exit):
+        awssox_module.perform_sso_login(profile)
+    mock_run.assert_not_called()
+
+
 ###############################################################################
 # pick_role_profile
 ###############################################################################
@@ -160,12 +448,31 @@ def test_pick_role_profile(mock_checkbox, input_selection, expected_role):
     assert result == expected_role
 
 
+@patch("questionary.checkbox")
+def test_pick_role_profile_auto_select_single(mock_checkbox):
+    """With auto_select, a single role is chosen without prompting."""
+    result = awssox_module.pick_role_profile(["some-role"], auto_select=True)
+    assert result == "some-role"
+    mock_checkbox.assert_not_called()
+
+
+@patch("questionary.checkbox")
+def test_pick_role_profile_auto_select_multiple_prompts(mock_checkbox):
+    """auto_select still prompts when there is more than one role."""
+    mock_checkbox.return_value.ask.return_value = ["other-role"]
+    result = awssox_module.pick_role_profile(
+        ["some-role", "other-role"], auto_select=True
+    )
+    assert result == "other-role"
+    mock_checkbox.assert_called_once()
+
+
 ###############################################################################
 # show_export_instructions
 ###############################################################################
 @patch("typer.echo")
-@patch("platform.system", return_value="Windows")
-def test_show_export_instructions_windows(mock_platform, mock_echo):
+@patch.object(awssox_module, "_IS_WINDOWS", True)
+def test_show_export_instructions_windows(mock_echo):
     """Verify Windows instructions are printed."""
     awssox_module.show_export_instructions("dev-1-admin-role")
 
@@ -175,8 +482,8 @@ def test_show_export_instructions_windows(mock_platform, mock_echo):
 
 
 @patch("typer.echo")
-@patch("platform.system", return_value="Linux")
-def test_show_export_instructions_unix(mock_platform, mock_echo):
+@patch.object(awssox_module, "_IS_WINDOWS", False)
+def test_show_export_instructions_unix(mock_echo):
     """Verify *nix export instructions are printed."""
     awssox_module.show_export_instructions("dev-1-admin-role")
 
@@ -242,6 +549,8 @@ def test_cli_list_profiles(mock_read, capsys):
 ###############################################################################
 # login (Full Command)
 ###############################################################################
+@pytest.mark.usefixtures("no_background_thread")
+@patch.object(awssox_module, "_has_role_profile", return_value=True)
 @patch.object(awssox_module, "read_aws_profiles")
 @patch.object(awssox_module, "pick_base_profile")
 @patch.object(awssox_module, "perform_sso_login")
@@ -255,6 +564,7 @@ def test_login_full_flow(
     mock_login,
     mock_pick_base,
     mock_read,
+    mock_has_role,
     capsys,
 ):
     """Test the login command from start to finish, ensuring each piece is called."""
@@ -265,14 +575,14 @@ def test_login_full_flow(
 
     # login calls sys.exit(0), so we expect SystemExit
     with pytest.raises(SystemExit):
-        awssox_module.login()
+        awssox_module.login(config_file=None, yes=False, exec_login=False)
 
     # Verify each helper function was called in sequence
     mock_read.assert_called_once()
-    mock_pick_base.assert_called_once()
-    mock_login.assert_called_once_with("dev-1")
+    mock_pick_base.assert_called_once_with({"dev-1": {}}, ["dev-1"])
+    mock_login.assert_called_once_with("dev-1", replace_process=False)
     mock_find_roles.assert_called_once_with({"dev-1": {}}, "dev-1")
-    mock_pick_role.assert_called_once_with(["dev-1-admin-role"])
+    mock_pick_role.assert_called_once_with(["dev-1-admin-role"], auto_select=False)
     mock_show_export.assert_called_once_with("dev-1-admin-role")
 
     captured = capsys.readouterr()
@@ -280,6 +590,7 @@ def test_login_full_flow(
     assert "Login successful!" in captured.out
 
 
+@pytest.mark.usefixtures("no_background_thread")
 @patch.object(awssox_module, "read_aws_profiles")
 def test_login_no_profiles(mock_read, capsys):
     """If read_aws_profiles returns {}, login should raise Exit.
@@ -288,12 +599,13 @@ def test_login_no_profiles(mock_read, capsys):
     """
     mock_read.return_value = {}
     with pytest.raises(typer.Exit):
-        awssox_module.login()
+        awssox_module.login(config_file=None, yes=False, exec_login=False)
 
     captured = capsys.readouterr()
     assert "No profiles found" in captured.out
 
 
+@pytest.mark.usefixtures("no_background_thread")
 @patch.object(awssox_module, "read_aws_profiles", return_value={"dev-1": {}})
 @patch.object(awssox_module, "pick_base_profile", return_value="dev-1")
 @patch.object(awssox_module, "perform_sso_login")
@@ -303,22 +615,61 @@ def test_login_no_role_profiles(mock_find, mock_login_fn, mock_pick, mock_read,
 
     The function then returns early.
     """
-    awssox_module.login()
+    awssox_module.login(config_file=None, yes=False, exec_login=False)
 
+    mock_login_fn.assert_called_once_with("dev-1", replace_process=False)
+    mock_find.assert_not_called()
     captured = capsys.readouterr()
     assert "No associated role profile found. Exiting..." in captured.out
 
 
+@pytest.mark.usefixtures("no_background_thread")
+@patch.object(awssox_module, "_has_role_profile", return_value=True)
 @patch.object(awssox_module, "read_aws_profiles", return_value={"dev-1": {}})
 @patch.object(awssox_module, "pick_base_profile", return_value="dev-1")
 @patch.object(awssox_module, "perform_sso_login")
 @patch.object(awssox_module, "find_role_profiles", return_value=["dev-1-admin-role"])
 @patch.object(awssox_module, "pick_role_profile", return_value="Skip role assumption")
 def test_login_skip_role(
-    mock_pick_role, mock_find, mock_login_fn, mock_pick, mock_read, capsys
+    mock_pick_role, mock_find, mock_login_fn, mock_pick, mock_read, mock_has, capsys
 ):
     """If user chooses to skip role assumption, we exit."""
-    awssox_module.login()
+    awssox_module.login(config_file=None, yes=False, exec_login=False)
 
     captured = capsys.readouterr()
     assert "Skipping role assumption. Goodbye!" in captured.out
+
+
+@pytest.mark.usefixtures("no_background_thread")
+@pytest.mark.parametrize("has_roles, expected", [(False, True), (True, False)])
+@patch.object(awssox_module, "read_aws_profiles", return_value={"dev-1": {}})
+@patch.object(awssox_module, "pick_base_profile", return_value="dev-1")
+@patch.object(awssox_module, "perform_sso_login")
+@patch.object(awssox_module, "pick_role_profile", return_value="Skip role assumption")
+def test_login_exec_only_without_roles(
+    mock_pick_role, mock_login_fn, mock_pick, mock_read, has_roles, expected
+):
+    """--exec replaces the process only when no role profile follows the login."""
+    with (
+        patch.object(
+            awssox_module, "_has_role_profile", return_value=has_roles
+        ) as mock_has_role,
+        patch.object(awssox_module, "find_role_profiles", return_value=["role"]),
+    ):
+        awssox_module.login(config_file=None, yes=False, exec_login=True)
+
+    mock_has_role.assert_called_once_with({"dev-1": {}}, "dev-1")
+
+    mock_login_fn.assert_called_once_with("dev-1", replace_process=expected)
+
+
+@patch.object(awssox_module, "read_aws_profiles", return_value={})
+def test_login_resolves_aws_cli_in_background(mock_read):
+    """Login starts resolving the AWS CLI before reading the config."""
+    with patch("threading.Thread") as mock_thread, pytest.raises(typer.Exit):
+        awssox_module.login(config_file=None, yes=False, exec_login=False)
+
+    mock_thread.assert_called_once_with(
+        target=awssox_module._aws_executable, daemon=True
+    )
+    mock_thread.return_value.start.assert_called_once()